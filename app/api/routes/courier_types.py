@@ -0,0 +1,22 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from starlette import status
+
+from app.db.courier_type_catalog import COURIER_TYPE_CATALOG
+from app.utils.rps_limiter import limiter
+
+router = APIRouter()
+
+
+@router.get("", status_code=status.HTTP_200_OK)
+@limiter.limit("10/seconds")
+async def get_courier_types(request: Request) -> JSONResponse:
+    """Справочник типов курьеров из памяти воркера вместе с версией, по ней можно сверить воркеры между собой"""
+    courier_types = await COURIER_TYPE_CATALOG.get_types()
+    response_data = {
+        "version": COURIER_TYPE_CATALOG.version,
+        "courier_types": [asdict(courier_type) for courier_type in courier_types.values()],
+    }
+    return JSONResponse(content=response_data, status_code=status.HTTP_200_OK)
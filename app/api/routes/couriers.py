@@ -9,6 +9,7 @@ from app.db.services.couriers_service import CourierService
 from app.models.dto import CourierDto
 from app.models.request_models import AddCouriersModel, PaginationModel
 from app.models.response_models import CourierStatsModel, ResponseCourierModel, ResponseCouriersModel
+from app.utils.constants import COPY_INGEST_MIN_ROWS
 from app.utils.db_to_api import build_response_courier
 from app.utils.rps_limiter import limiter
 
@@ -32,7 +33,9 @@ async def get_couriers(request: Request, pagination: PaginationModel = Depends()
 @limiter.limit("10/seconds")
 async def post_couriers(request: Request, couriers: AddCouriersModel) -> JSONResponse:
     dto_couriers = [CourierDto(**api_courier.dict()) for api_courier in couriers.couriers]
-    retrieved_couriers_id = await CourierService.add_couriers(dto_couriers)
+    retrieved_couriers_id = await CourierService.add_couriers(
+        dto_couriers, use_copy=len(dto_couriers) >= COPY_INGEST_MIN_ROWS
+    )
     if not retrieved_couriers_id:
         return JSONResponse(content={"status": "error"}, status_code=status.HTTP_400_BAD_REQUEST)
     response_couriers = []
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import couriers, orders
+from app.api.routes import courier_types, couriers, orders
 from app.api.routes.test_routes import router as test_routes
 
 router = APIRouter()
@@ -8,3 +8,4 @@ router = APIRouter()
 router.include_router(test_routes)
 router.include_router(orders.router, prefix="/orders")
 router.include_router(couriers.router, prefix="/couriers")
+router.include_router(courier_types.router, prefix="/courier-types")
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, Path, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from starlette import status
 from typing_extensions import Annotated
 
@@ -7,8 +7,10 @@ from app.db.services.orders_service import OrdersService
 from app.models.dto import CompleteOrderDto, OrderDto
 from app.models.request_models import AddOrdersModel, OrdersCompleteModel, PaginationModel
 from app.models.response_models import ResponseOrderModel, ResponseOrdersModel
+from app.utils.constants import COPY_INGEST_MIN_ROWS
 from app.utils.db_to_api import build_response_order
 from app.utils.rps_limiter import limiter
+from app.utils.stream_import import import_orders_stream
 
 router = APIRouter()
 
@@ -27,14 +29,22 @@ async def get_orders(request: Request, pagination: PaginationModel = Depends())
 @limiter.limit("10/seconds")
 async def post_orders(request: Request, orders: AddOrdersModel) -> str:
     dto_orders = [OrderDto(**api_order.dict()) for api_order in orders.orders]
-    retrieved_orders_id = await OrdersService.add_orders(dto_orders)
+    retrieved_orders_id = await OrdersService.add_orders(dto_orders, use_copy=len(dto_orders) >= COPY_INGEST_MIN_ROWS)
     orders_response = []
     for num, order in enumerate(orders.orders):
-        new_order = ResponseOrderModel(order_id=retrieved_orders_id[num][0], **order.dict(), completed_time=None)
+        new_order = ResponseOrderModel(order_id=retrieved_orders_id[num], **order.dict(), completed_time=None)
         orders_response.append(new_order.dict())
     return JSONResponse(content=orders_response, status_code=status.HTTP_200_OK)
 
 
+@router.post("/stream", status_code=status.HTTP_200_OK)
+@limiter.limit("10/seconds")
+async def post_orders_stream(request: Request) -> StreamingResponse:
+    """Импорт заказов из тела в формате NDJSON (один OrderRequestModel на строку),
+    заказы пишутся частями по мере чтения тела, ответ - NDJSON с результатом по каждой части"""
+    return StreamingResponse(import_orders_stream(request.stream()), media_type="application/x-ndjson")
+
+
 @router.get("/{order_id}", status_code=status.HTTP_200_OK)
 @limiter.limit("10/seconds")
 async def get_order_by_id(request: Request, order_id: Annotated[int, Path(title="Order ID", le=2147483647, gt=0)]) -> str:
@@ -0,0 +1,57 @@
+from collections.abc import Iterable
+
+from sqlalchemy import text
+
+from app.db.db_config import DB_DATA
+from app.utils.constants import AREA_REGISTRY_SIZE
+from app.utils.lru_cache import LRUCache
+
+INSERT_AREAS_QUERY = text(
+    """INSERT INTO area (area_number)
+        SELECT unnest(CAST(:area_numbers AS integer[]))
+        ON CONFLICT (area_number) DO NOTHING"""
+)
+SELECT_AREAS_QUERY = text("SELECT area_id, area_number FROM area WHERE area_number = ANY(:area_numbers)")
+
+
+class AreaRegistry:
+    """Реестр соответствия номера района и его area_id в памяти процесса.
+    Районы только добавляются и никогда не меняют id, поэтому в базу идем только за номерами,
+    которых еще нет в кеше. Новые районы создаются в отдельной короткой транзакции,
+    так что закешированный id не может пропасть из-за отката импорта"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.cache = LRUCache(maxsize=maxsize)
+
+    async def resolve(self, area_numbers: Iterable[int]) -> dict[int, int]:
+        """Возвращает словарь номер района -> area_id, недостающие районы создает в базе"""
+        area_id_by_area_number = {}
+        missing_area_numbers = []
+        for area_number in set(area_numbers):
+            area_id = self.cache.get(area_number)
+            if area_id is None:
+                missing_area_numbers.append(area_number)
+            else:
+                area_id_by_area_number[area_number] = area_id
+        if missing_area_numbers:
+            # сортирую, чтобы параллельные вставки районов брали блокировки в одном порядке
+            loaded_areas = await self._load(sorted(missing_area_numbers))
+            for area_number, area_id in loaded_areas.items():
+                self.cache.put(area_number, area_id)
+            area_id_by_area_number.update(loaded_areas)
+        return area_id_by_area_number
+
+    @staticmethod
+    async def _load(area_numbers: list[int]) -> dict[int, int]:
+        new_session = DB_DATA.session_factory()
+        async with new_session() as session:
+            await session.execute(INSERT_AREAS_QUERY, {"area_numbers": area_numbers})
+            await session.commit()
+            select_areas_cursor = await session.execute(SELECT_AREAS_QUERY, {"area_numbers": area_numbers})
+            return {area_number: area_id for area_id, area_number in select_areas_cursor.all()}
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+AREA_REGISTRY = AreaRegistry(maxsize=AREA_REGISTRY_SIZE)
@@ -0,0 +1,81 @@
+import asyncio
+import hashlib
+import logging
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import asyncpg
+from sqlalchemy import text
+
+from app.db.db_config import DB_DATA
+from app.models.dto import CourierTypeDto
+
+logger = logging.getLogger(__name__)
+
+COURIER_TYPE_CHANGED_CHANNEL = "courier_type_changed"
+SELECT_COURIER_TYPES_QUERY = text(
+    """SELECT id, rating_coefficient, salary_coefficient, max_area, max_weight_orders, max_orders_count
+        FROM courier_type ORDER BY id"""
+)
+
+
+class CourierTypeCatalog:
+    """Справочник типов курьеров в памяти процесса.
+    Загружается на старте приложения (или при первом обращении) и перечитывается явно через reload
+    либо по уведомлению из базы: триггер на courier_type делает NOTIFY courier_type_changed,
+    так что после изменения справочника (или ручного NOTIFY) его перечитывают все воркеры.
+    Версия - хеш содержимого, у воркеров с одинаковым справочником она совпадает"""
+
+    def __init__(self) -> None:
+        self._types = MappingProxyType({})
+        self.version = None
+        self._listen_connection = None
+        self._reload_tasks = set()
+
+    @property
+    def loaded(self) -> bool:
+        return self.version is not None
+
+    async def get_types(self) -> Mapping[str, CourierTypeDto]:
+        """Возвращает неизменяемый словарь id типа -> тип, при первом обращении загружает справочник"""
+        if not self.loaded:
+            await self.reload()
+        return self._types
+
+    async def get(self, type_id: str) -> CourierTypeDto | None:
+        courier_types = await self.get_types()
+        return courier_types.get(type_id)
+
+    async def reload(self) -> None:
+        """Перечитывает справочник из базы и атомарно подменяет его"""
+        new_session = DB_DATA.session_factory()
+        async with new_session() as session:
+            courier_types_cursor = await session.execute(SELECT_COURIER_TYPES_QUERY)
+            courier_types = [CourierTypeDto(*courier_type) for courier_type in courier_types_cursor.all()]
+        version_hash = hashlib.sha256(repr(courier_types).encode())
+        self._types = MappingProxyType({courier_type.type_id: courier_type for courier_type in courier_types})
+        self.version = version_hash.hexdigest()[:16]
+        logger.info("courier type catalog loaded, version %s", self.version)
+
+    async def start_listening(self) -> None:
+        """Подписывается на уведомления об изменении справочника на отдельном соединении вне пула"""
+        # asyncpg понимает обычный libpq url, тот же, что используется для миграций
+        self._listen_connection = await asyncpg.connect(DB_DATA.get_sync_db_url())
+        await self._listen_connection.add_listener(COURIER_TYPE_CHANGED_CHANNEL, self._on_notification)
+
+    async def stop_listening(self) -> None:
+        if self._listen_connection is not None:
+            await self._listen_connection.close()
+            self._listen_connection = None
+
+    def _on_notification(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        reload_task = asyncio.get_running_loop().create_task(self.reload())
+        self._reload_tasks.add(reload_task)
+        reload_task.add_done_callback(self._reload_tasks.discard)
+
+    def clear(self) -> None:
+        self._types = MappingProxyType({})
+        self.version = None
+
+
+COURIER_TYPE_CATALOG = CourierTypeCatalog()
@@ -2,47 +2,42 @@ from datetime import datetime
 
 from sqlalchemy import select, text
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.area_registry import AREA_REGISTRY
+from app.db.courier_type_catalog import COURIER_TYPE_CATALOG
 from app.db.db_config import DB_DATA
-from app.db.schema import Area, Courier, courier_area, CourierWorkTime
-from app.db.utils import bulk_insert_by_parts, CourierStats
+from app.db.schema import Courier, courier_area, CourierWorkTime
+from app.db.utils import bulk_insert_by_parts, copy_records, CourierStats
 from app.models.dto import CourierDto
 from app.utils.constants import MAX_COURIER_WORKING_HOUR_COUNT
 
 
 class CourierService:
     @staticmethod
-    async def add_couriers(new_couriers: list[CourierDto]) -> list[Courier] | bool:
+    async def add_couriers(new_couriers: list[CourierDto], use_copy: bool = False) -> list[int] | bool:
+        """Добавляет курьеров и возвращает их id в порядке запроса, False если тип курьера не подходит под районы.
+        С use_copy=True данные идут через бинарный COPY, это быстрее на больших импортах"""
+        courier_types = await COURIER_TYPE_CATALOG.get_types()
+        couriers_to_add = []
+        for courier in new_couriers:
+            request_valid_courier_type = courier_types.get(courier.courier_type)
+            if not request_valid_courier_type or len(courier.regions) > request_valid_courier_type.max_area:
+                return False
+            couriers_to_add.append({"courier_type": courier.courier_type})
+        area_id_by_area_number = await AREA_REGISTRY.resolve(
+            area_number for courier in new_couriers for area_number in courier.regions
+        )
         new_session = DB_DATA.session_factory()
 
         async with new_session() as session:
-            all_types_query = text(
-                """SELECT courier_type.id, courier_type.max_area
-                        FROM courier_type"""
-            )
-            courier_types_cursor = await session.execute(all_types_query)
-            possible_types = {courier_type[0]: courier_type[1] for courier_type in courier_types_cursor.all()}
-            areas_to_add = []
-            couriers_to_add = []
-            for courier in new_couriers:
-                request_valid_courier_type = possible_types.get(courier.courier_type)
-                if not request_valid_courier_type or len(courier.regions) > request_valid_courier_type:
-                    return False
-                areas_to_add.extend([{"area_number": area} for area in courier.regions])
-                couriers_to_add.append({"courier_type": courier.courier_type})
+            if use_copy:
+                return await CourierService._add_couriers_by_copy(session, new_couriers, area_id_by_area_number)
 
             add_couriers_query = insert(Courier).values(couriers_to_add).returning(Courier.courier_id)
             added_couriers_cursor = await session.execute(add_couriers_query)
             added_couriers_id = added_couriers_cursor.scalars().all()
 
-            add_areas_query = insert(Area).values(areas_to_add).on_conflict_do_nothing(index_elements=["area_number"])
-            await session.execute(add_areas_query)
-            await session.commit()
-            unique_areas_number = {v for dict_obj in areas_to_add for v in dict_obj.values()}
-            select_areas_query = text("SELECT area_id, area_number FROM area WHERE area_number = ANY(:id_array)")
-            select_areas_cursor = await session.execute(select_areas_query, {"id_array": unique_areas_number})
-            area_id_by_area_number = {area[1]: area[0] for area in select_areas_cursor.all()}
-
             mapped_couriers_areas = []
             mapped_couriers_working_hours = []
             for i, courier in enumerate(new_couriers):
@@ -74,6 +69,66 @@ class CourierService:
             )
             return added_couriers_id
 
+    @staticmethod
+    async def _add_couriers_by_copy(
+        session: AsyncSession, new_couriers: list[CourierDto], area_id_by_area_number: dict[int, int]
+    ) -> list[int]:
+        """Импорт курьеров через COPY: курьеры заливаются во временную staging таблицу,
+        оттуда INSERT ... SELECT переносит их в courier, районы и часы работы заливаются COPY сразу
+        в courier_area и courier_work_time. id курьеров выдаются последовательностью в порядке position,
+        поэтому сортировка по id дает порядок запроса"""
+        await session.execute(
+            text(
+                """CREATE TEMPORARY TABLE courier_staging (
+                    position integer NOT NULL,
+                    courier_type varchar NOT NULL
+                ) ON COMMIT DROP"""
+            )
+        )
+        await copy_records(
+            session=session,
+            table_name="courier_staging",
+            columns=["position", "courier_type"],
+            records=((position, courier.courier_type) for position, courier in enumerate(new_couriers)),
+        )
+        added_couriers_cursor = await session.execute(
+            text(
+                """WITH inserted AS (
+                    INSERT INTO courier (courier_type)
+                        SELECT courier_type FROM courier_staging ORDER BY position
+                    RETURNING courier_id
+                )
+                SELECT courier_id FROM inserted ORDER BY courier_id"""
+            )
+        )
+        added_couriers_id = added_couriers_cursor.scalars().all()
+        await copy_records(
+            session=session,
+            table_name="courier_area",
+            columns=["courier_id", "area_id"],
+            records=(
+                (added_couriers_id[i], area_id_by_area_number[area_number])
+                for i, courier in enumerate(new_couriers)
+                for area_number in courier.regions
+            ),
+        )
+        await copy_records(
+            session=session,
+            table_name="courier_work_time",
+            columns=["courier_id", "start_at", "end_at"],
+            records=(
+                (
+                    added_couriers_id[i],
+                    datetime.strptime(start_time, "%H:%M").time(),
+                    datetime.strptime(end_time, "%H:%M").time(),
+                )
+                for i, courier in enumerate(new_couriers)
+                for start_time, end_time in (hour_delta.split("-") for hour_delta in courier.working_hours)
+            ),
+        )
+        await session.commit()
+        return added_couriers_id
+
     @staticmethod
     async def get_courier_by_id(courier_id: int) -> bool | Courier:
         new_session = DB_DATA.session_factory()
@@ -90,7 +145,8 @@ class CourierService:
             return res.scalars().all()
 
     @staticmethod
-    async def get_courier_stats(courier_id: int, start_date: datetime, end_date: datetime) -> Courier:
+    async def get_courier_stats(courier_id: int, start_date: datetime, end_date: datetime) -> dict | None:
+        """Считает заработок и рейтинг курьера за период, коэффициенты берутся из справочника типов курьеров"""
         new_session = DB_DATA.session_factory()
         async with new_session() as session:
             db_courier = await session.get(Courier, courier_id)
@@ -98,23 +154,9 @@ class CourierService:
                 return None
             stats_query = text(
                 """
-                SELECT "courier".courier_id,
-                    (COUNT("order".order_id) / NULLIF(((EXTRACT(EPOCH FROM  :end_date ::timestamp) -
-                            EXTRACT(EPOCH FROM :start_date ::timestamp)) / 3600), 0)
-                    * MAX("courier_type".rating_coefficient)) as coefficient,
-                MAX("courier_type".salary_coefficient) * SUM("order".cost) AS total_salary
-                FROM "courier"
-                LEFT JOIN
-                    (SELECT order_id, courier, cost from "order"
-                        WHERE "order".completed_time >= :start_date
-                            AND "order".completed_time < :end_date)
-                    "order"
-                    ON "courier".courier_id = "order".courier
-                LEFT JOIN "courier_type"
-                    ON "courier_type".id = "courier".courier_type
-                    WHERE "courier".courier_id = :courier_id
-                GROUP BY "courier".courier_id
-           """
+                SELECT COUNT(order_id), SUM(cost) FROM "order"
+                WHERE courier = :courier_id AND completed_time >= :start_date AND completed_time < :end_date
+                """
             )
             stats_coursor = await session.execute(
                 stats_query,
@@ -124,5 +166,11 @@ class CourierService:
                     "end_date": end_date,
                 },
             )
-            stats_res = CourierStats(*stats_coursor.all()[0])
-            return {"courier": db_courier, "salary": stats_res.salary, "rating": stats_res.rating}
+            stats_res = CourierStats(*stats_coursor.one())
+            courier_type = await COURIER_TYPE_CATALOG.get(db_courier.courier_type)
+            period_seconds = int((end_date - start_date).total_seconds())
+            rating = None
+            if period_seconds > 0:
+                rating = stats_res.completed_count * courier_type.rating_coefficient * 3600 // period_seconds
+            salary = stats_res.total_cost * courier_type.salary_coefficient if stats_res.total_cost is not None else None
+            return {"courier": db_courier, "salary": salary, "rating": rating}
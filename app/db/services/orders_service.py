@@ -1,69 +1,139 @@
 from sqlalchemy import select, text
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.area_registry import AREA_REGISTRY
 from app.db.db_config import DB_DATA
-from app.db.schema import Area, Order, OrderDeliveryHour
-from app.db.utils import bulk_insert_by_parts
+from app.db.schema import Order
+from app.db.utils import copy_records
 from app.models.dto import CompleteOrderDto, OrderDto
-from app.utils.constants import MAX_DELIVERY_TIME_ORDER_COUNT, MAX_ORDER_COUNT
+from app.utils.constants import ORDER_INSERT_CHUNK_SIZE
+from app.utils.split_list import split_list
 from app.utils.time_converters import str_to_time_obj
 
+# Заказы и их часы доставки вставляются одним запросом: id заказов выдаются в порядке position,
+# по нему же к заказам привязываются часы доставки
+ADD_ORDERS_QUERY = text(
+    """
+    WITH new_order AS (
+        SELECT * FROM unnest(
+            CAST(:weights AS double precision[]), CAST(:area_ids AS integer[]), CAST(:costs AS integer[])
+        ) WITH ORDINALITY AS new_order(weight, area_id, cost, position)
+    ),
+    inserted_order AS (
+        INSERT INTO "order" (weight, region, cost, assigned)
+            SELECT weight, area_id, cost, false FROM new_order ORDER BY position
+        RETURNING order_id
+    ),
+    numbered_order AS (
+        SELECT order_id, row_number() OVER (ORDER BY order_id) AS position FROM inserted_order
+    ),
+    inserted_delivery_hour AS (
+        INSERT INTO order_delivery_hour (order_id, start_at, end_at)
+            SELECT numbered_order.order_id, delivery_hour.start_at, delivery_hour.end_at
+            FROM unnest(
+                CAST(:hour_positions AS bigint[]), CAST(:hour_starts AS time[]), CAST(:hour_ends AS time[])
+            ) AS delivery_hour(position, start_at, end_at)
+            JOIN numbered_order ON numbered_order.position = delivery_hour.position
+    )
+    SELECT order_id FROM numbered_order ORDER BY position
+    """
+)
+
 
 class OrdersService:
     @staticmethod
-    async def add_orders(orders: list[OrderDto]) -> list[Order]:
+    async def add_orders(orders: list[OrderDto], use_copy: bool = False) -> list[int]:
+        """Добавляет заказы и возвращает их id в порядке запроса.
+        С use_copy=True данные идут через бинарный COPY в staging таблицу, это быстрее на больших импортах"""
+        area_id_by_area_number = await AREA_REGISTRY.resolve(order.regions for order in orders)
         new_session = DB_DATA.session_factory()
-
         async with new_session() as session:
-            orders_to_add = []
-            areas_to_add = []
-            orders_for_answ = []
-
-            for order in orders:
-                orders_for_answ.append(order)
-                areas_to_add.append({"area_number": order.regions})
-                orders_to_add.append({"cost": order.cost, "weight": order.weight, "region": None})
-
-            insert_or_ignore_areas_query = (
-                insert(Area).values(areas_to_add).on_conflict_do_nothing(index_elements=["area_number"])
-            )
-            await session.execute(insert_or_ignore_areas_query)
+            if use_copy:
+                return await OrdersService._add_orders_by_copy(session, orders, area_id_by_area_number)
+            added_orders_id = []
+            for orders_chunk in split_list(orders, ORDER_INSERT_CHUNK_SIZE):
+                added_chunk_id = await OrdersService._add_orders_chunk(session, orders_chunk, area_id_by_area_number)
+                added_orders_id.extend(added_chunk_id)
             await session.commit()
+            return added_orders_id
 
-            unique_areas_number = {area_number for area_dict in areas_to_add for area_number in area_dict.values()}
-            get_areas_by_number_query = text("SELECT area_id, area_number FROM area WHERE area_number = ANY(:id_array)")
-            get_areas_by_number_cursor = await session.execute(get_areas_by_number_query, {"id_array": unique_areas_number})
-            get_areas_by_number_res = get_areas_by_number_cursor.all()
-
-            area_id_by_area_number = {area[1]: area[0] for area in get_areas_by_number_res}
-            for i, order in enumerate(orders_to_add):
-                order["region"] = area_id_by_area_number[orders[i].regions]
+    @staticmethod
+    async def _add_orders_chunk(
+        session: AsyncSession, orders: list[OrderDto], area_id_by_area_number: dict[int, int]
+    ) -> list[int]:
+        """Вставляет часть заказов одним запросом: заказы и часы доставки передаются массивами,
+        раскрываются через unnest и пишутся цепочкой data-modifying CTE, так что на часть нужен один поход в базу"""
+        hour_positions = []
+        hour_starts = []
+        hour_ends = []
+        for position, order in enumerate(orders, start=1):
+            for hour_delta in order.delivery_hours:
+                start_time, end_time = hour_delta.split("-")
+                hour_positions.append(position)
+                hour_starts.append(str_to_time_obj(start_time).time())
+                hour_ends.append(str_to_time_obj(end_time).time())
+        added_orders_cursor = await session.execute(
+            ADD_ORDERS_QUERY,
+            {
+                "weights": [order.weight for order in orders],
+                "area_ids": [area_id_by_area_number[order.regions] for order in orders],
+                "costs": [order.cost for order in orders],
+                "hour_positions": hour_positions,
+                "hour_starts": hour_starts,
+                "hour_ends": hour_ends,
+            },
+        )
+        return added_orders_cursor.scalars().all()
 
-            add_orders_res = await bulk_insert_by_parts(
-                session=session,
-                model=Order,
-                partitision_size=MAX_ORDER_COUNT,
-                batch=orders_to_add,
-                returning=Order.order_id,
+    @staticmethod
+    async def _add_orders_by_copy(
+        session: AsyncSession, orders: list[OrderDto], area_id_by_area_number: dict[int, int]
+    ) -> list[int]:
+        """Импорт заказов через COPY: заказы заливаются в временную staging таблицу,
+        оттуда одним INSERT ... SELECT переносятся в order, часы доставки заливаются COPY сразу в order_delivery_hour.
+        id заказов выдаются последовательностью в порядке position, поэтому сортировка по id дает порядок запроса"""
+        await session.execute(
+            text(
+                """CREATE TEMPORARY TABLE order_staging (
+                    position integer NOT NULL,
+                    weight double precision NOT NULL,
+                    area_id integer NOT NULL,
+                    cost integer NOT NULL
+                ) ON COMMIT DROP"""
             )
-            await session.commit()
-            mapped_order_delivery_hours = []
-            for i, order_data in enumerate(orders_for_answ):
-                for hour_delta in order_data.delivery_hours:
-                    start_time, end_time = hour_delta.split("-")
-                    new_working_hours = {
-                        "order_id": add_orders_res[i][0],
-                        "start_at": str_to_time_obj(start_time),
-                        "end_at": str_to_time_obj(end_time),
-                    }
-                    mapped_order_delivery_hours.append(new_working_hours)
-            await bulk_insert_by_parts(
-                session=session,
-                model=OrderDeliveryHour,
-                partitision_size=MAX_DELIVERY_TIME_ORDER_COUNT,
-                batch=mapped_order_delivery_hours,
+        )
+        await copy_records(
+            session=session,
+            table_name="order_staging",
+            columns=["position", "weight", "area_id", "cost"],
+            records=(
+                (position, order.weight, area_id_by_area_number[order.regions], order.cost)
+                for position, order in enumerate(orders)
+            ),
+        )
+        added_orders_cursor = await session.execute(
+            text(
+                """WITH inserted AS (
+                    INSERT INTO "order" (weight, region, cost, assigned)
+                        SELECT weight, area_id, cost, false FROM order_staging ORDER BY position
+                    RETURNING order_id
+                )
+                SELECT order_id FROM inserted ORDER BY order_id"""
             )
-            return add_orders_res
+        )
+        added_orders_id = added_orders_cursor.scalars().all()
+        await copy_records(
+            session=session,
+            table_name="order_delivery_hour",
+            columns=["order_id", "start_at", "end_at"],
+            records=(
+                (added_orders_id[i], str_to_time_obj(start_time).time(), str_to_time_obj(end_time).time())
+                for i, order in enumerate(orders)
+                for start_time, end_time in (hour_delta.split("-") for hour_delta in order.delivery_hours)
+            ),
+        )
+        await session.commit()
+        return added_orders_id
 
     @staticmethod
     async def get_order_by_id(order_id: int) -> Order | None:
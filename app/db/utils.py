@@ -1,8 +1,10 @@
 import asyncio
 from collections import namedtuple
+from collections.abc import Iterable
 
 from sqlalchemy import Column
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import decl_base, Session
 
 from app.utils.split_list import split_list
@@ -37,5 +39,14 @@ async def bulk_insert_by_parts(
             return query_cursor.all()
 
 
-CourierStats = namedtuple("Stats", ["id", "rating", "salary"])  # Именнованный кортеж, для удобного
+async def copy_records(session: AsyncSession, table_name: str, columns: list[str], records: Iterable[tuple]) -> None:
+    """Заливает записи в таблицу через бинарный COPY asyncpg на соединении сессии.
+    Соединение берется то же, что и у сессии, поэтому COPY попадает в её текущую транзакцию,
+    транзакция должна быть уже начата каким-нибудь запросом через сессию"""
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(table_name, records=records, columns=columns)
+
+
+CourierStats = namedtuple("Stats", ["completed_count", "total_cost"])  # Именнованный кортеж, для удобного
 # перехода из рекордов с raw sql в нормальный маппинг
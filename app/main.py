@@ -1,3 +1,6 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
@@ -6,6 +9,7 @@ from slowapi.errors import RateLimitExceeded
 from starlette import status
 
 from app.api.routes.main_routes import router as all_routes
+from app.db.courier_type_catalog import COURIER_TYPE_CATALOG
 from app.utils.rps_limiter import limiter
 
 
@@ -14,7 +18,16 @@ def custom_request_validation_error(request: Request, exc: Exception) -> JSONRes
     return JSONResponse({"message": "error"}, status_code=status.HTTP_400_BAD_REQUEST)
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Прогревает справочники на старте и подписывается на их изменения"""
+    await COURIER_TYPE_CATALOG.reload()
+    await COURIER_TYPE_CATALOG.start_listening()
+    yield
+    await COURIER_TYPE_CATALOG.stop_listening()
+
+
+app = FastAPI(lifespan=lifespan)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.include_router(all_routes)
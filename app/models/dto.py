@@ -27,3 +27,15 @@ class CompleteOrderDto:
     courier_id: int
     order_id: int
     complete_time: str
+
+
+@dataclass(frozen=True)
+class CourierTypeDto:
+    """Dto model for courier type from catalog"""
+
+    type_id: str
+    rating_coefficient: int
+    salary_coefficient: int
+    max_area: int
+    max_weight_orders: int
+    max_orders_count: int
@@ -4,10 +4,18 @@ TIMEDELTA_REGEX = r"^([0-9]|0[0-9]|1[0-9]|2[0-3]):[0-5][0-9]-([0-9]|0[0-9]|1[0-9
 TIME_FORMAT = "%H:%M"
 
 """CALCULATED MAX VALUE OF INSERTED INTO DB OBJECTS"""
-MAX_DELIVERY_TIME_ORDER_COUNT = 10922
 MAX_COURIER_WORKING_HOUR_COUNT = 10922
-MAX_ORDER_COUNT = 8191
 """
 Проще говоря, максимальное кол-во которое можно вставить за один
 инсерт без ошибки вставки слишком большого кол-во объектов в бд
 """
+# Размер части заказов, которая вставляется одним запросом (данные идут массивами, так что лимит параметров не мешает)
+ORDER_INSERT_CHUNK_SIZE = 5000
+# Начиная с такого кол-ва объектов в запросе импорт идет через COPY, а не через INSERT
+COPY_INGEST_MIN_ROWS = 5000
+# Сколько районов держим в памяти в реестре номер района -> area_id
+AREA_REGISTRY_SIZE = 10000
+# Сколько строк NDJSON потока импорта заказов валидируется и пишется в базу за раз
+ORDER_STREAM_CHUNK_SIZE = 5000
+# Максимальная длина одной строки NDJSON в байтах, строки длиннее считаются ошибочными
+MAX_NDJSON_LINE_SIZE = 65536
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass
+class CacheStats:
+    """Счетчики работы кеша"""
+
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def dict(self) -> dict:
+        return asdict(self)
+
+
+class LRUCache:
+    """Кеш ограниченного размера с вытеснением давно не использованных ключей и счетчиками попаданий"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Возвращает значение по ключу и помечает ключ как недавно использованный"""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Кладет значение, при переполнении вытесняет самый давно использованный ключ"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очищает кеш вместе со счетчиками"""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self._data), maxsize=self.maxsize, hits=self.hits, misses=self.misses, evictions=self.evictions
+        )
@@ -0,0 +1,31 @@
+import json
+from collections.abc import AsyncIterator
+
+
+async def iter_ndjson_lines(body: AsyncIterator[bytes], max_line_size: int) -> AsyncIterator[tuple[int, bytes | None]]:
+    """Режет поток байт на строки NDJSON по мере поступления, отдает пары (номер строки, строка).
+    Пустые строки пропускаются, вместо строки длиннее max_line_size отдается None, сама строка не копится в памяти"""
+    buffer = b""
+    line_number = 0
+    skip_line = False
+    async for chunk in body:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if skip_line:
+                skip_line = False
+                yield line_number, None
+            elif line.strip():
+                yield line_number, line if len(line) <= max_line_size else None
+        if len(buffer) > max_line_size:
+            buffer = b""
+            skip_line = True
+    if skip_line:
+        yield line_number + 1, None
+    elif buffer.strip():
+        yield line_number + 1, buffer
+
+
+def dump_ndjson_line(data: dict) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode() + b"\n"
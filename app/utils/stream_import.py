@@ -0,0 +1,52 @@
+from collections.abc import AsyncIterator
+
+from pydantic import ValidationError
+
+from app.db.services.orders_service import OrdersService
+from app.models.dto import OrderDto
+from app.models.request_models import OrderRequestModel
+from app.utils.constants import COPY_INGEST_MIN_ROWS, MAX_NDJSON_LINE_SIZE, ORDER_STREAM_CHUNK_SIZE
+from app.utils.ndjson import dump_ndjson_line, iter_ndjson_lines
+
+
+def _line_error(line_number: int, exc: ValidationError | None) -> dict:
+    if exc is None:
+        return {"line": line_number, "message": "line is too long"}
+    messages = ["%s: %s" % (".".join(str(loc) for loc in error["loc"]), error["msg"]) for error in exc.errors()]
+    return {"line": line_number, "message": "; ".join(messages)}
+
+
+async def _write_chunk(chunk_number: int, dto_orders: list[OrderDto], errors: list[dict]) -> bytes:
+    orders_id = []
+    if dto_orders:
+        orders_id = await OrdersService.add_orders(dto_orders, use_copy=len(dto_orders) >= COPY_INGEST_MIN_ROWS)
+    return dump_ndjson_line({"chunk": chunk_number, "order_ids": orders_id, "errors": errors})
+
+
+async def import_orders_stream(body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Импортирует заказы из NDJSON потока частями по ORDER_STREAM_CHUNK_SIZE строк, пока тело еще приходит.
+    На каждую часть отдает строку с id добавленных заказов (в порядке валидных строк) и ошибками по номерам строк,
+    в памяти одновременно лежит только одна часть"""
+    chunk_number = 0
+    chunk_lines_count = 0
+    dto_orders = []
+    errors = []
+    async for line_number, line in iter_ndjson_lines(body, max_line_size=MAX_NDJSON_LINE_SIZE):
+        chunk_lines_count += 1
+        if line is None:
+            errors.append(_line_error(line_number, None))
+        else:
+            try:
+                api_order = OrderRequestModel.parse_raw(line)
+            except ValidationError as exc:
+                errors.append(_line_error(line_number, exc))
+            else:
+                dto_orders.append(OrderDto(**api_order.dict()))
+        if chunk_lines_count == ORDER_STREAM_CHUNK_SIZE:
+            yield await _write_chunk(chunk_number, dto_orders, errors)
+            chunk_number += 1
+            chunk_lines_count = 0
+            dto_orders = []
+            errors = []
+    if chunk_lines_count:
+        yield await _write_chunk(chunk_number, dto_orders, errors)
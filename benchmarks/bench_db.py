@@ -0,0 +1,42 @@
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy_utils import create_database, drop_database
+
+from app.db.area_registry import AREA_REGISTRY
+from app.db.db_config import DB_DATA, DbConfig, params
+
+TRUNCATE_ALL_QUERY = text(
+    'TRUNCATE "order_delivery_hour", "order", "courier_work_time", "courier_area", "courier", "area" RESTART IDENTITY'
+)
+
+
+@contextmanager
+def temporary_database() -> Iterator[DbConfig]:
+    """Поднимает временную базу с накатанными миграциями под бенчмарк, по аналогии с фикстурами тестов,
+    конфиг DB_DATA на время работы смотрит в неё, после завершения база удаляется"""
+    db_data = DbConfig(
+        DATABASE_HOST=params.DATABASE_HOST,
+        DATABASE_USERNAME=params.DATABASE_USERNAME,
+        DATABASE_PASSWORD=params.DATABASE_PASSWORD,
+        DATABASE_DB_NAME=".".join([uuid.uuid4().hex, "bench"]),
+    )
+    create_database(db_data.get_sync_db_url())
+    try:
+        command.upgrade(Config("./alembic.ini"), "head")
+        yield db_data
+    finally:
+        drop_database(db_data.get_sync_db_url())
+
+
+async def truncate_all() -> None:
+    """Очищает таблицы с данными между прогонами, справочник типов курьеров не трогает"""
+    new_session = DB_DATA.session_factory()
+    async with new_session() as session:
+        await session.execute(TRUNCATE_ALL_QUERY)
+        await session.commit()
+    AREA_REGISTRY.clear()
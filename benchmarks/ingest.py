@@ -0,0 +1,83 @@
+"""Бенчмарк импорта заказов и курьеров: INSERT ... VALUES по частям против COPY через staging таблицы.
+
+Запуск (нужна поднятая база, как для тестов):
+    python -m benchmarks.ingest --rows 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import time
+from random import choice, randint, uniform
+
+from sqlalchemy.exc import DBAPIError
+
+from app.db.services.couriers_service import CourierService
+from app.db.services.orders_service import OrdersService
+from app.models.dto import CourierDto, OrderDto
+from benchmarks.bench_db import temporary_database, truncate_all
+from utils.data_generators.generate_couriers import COURIER_CHOICES
+from utils.data_generators.generate_orders import TIMEDELTA_CHOICES
+
+MAX_AREA_BY_TYPE = {"FOOT": 1, "BIKE": 2, "AUTO": 3}
+
+
+def generate_order_dtos(n_orders: int) -> list[OrderDto]:
+    """Генерирует dto заказов напрямую, без pydantic моделей, чтобы не мерить их валидацию"""
+    return [
+        OrderDto(
+            weight=uniform(0.01, 10),
+            regions=randint(1, 99),
+            delivery_hours=[choice(TIMEDELTA_CHOICES) for _ in range(randint(1, 8))],
+            cost=randint(10, 10000),
+        )
+        for _ in range(n_orders)
+    ]
+
+
+def generate_courier_dtos(n_couriers: int) -> list[CourierDto]:
+    """Генерирует dto курьеров напрямую, без pydantic моделей"""
+    couriers = []
+    for _ in range(n_couriers):
+        courier_type = choice(COURIER_CHOICES)
+        regions = list({randint(1, 99) for _ in range(MAX_AREA_BY_TYPE[courier_type])})
+        working_hours = [choice(TIMEDELTA_CHOICES) for _ in range(randint(1, 8))]
+        couriers.append(CourierDto(courier_type=courier_type, regions=regions, working_hours=working_hours))
+    return couriers
+
+
+async def measure(coroutine_factory: callable) -> float | None:
+    """Время выполнения импорта в секундах, None если импорт упал (старый путь не вставляет больше int16 районов)"""
+    await truncate_all()
+    started_at = time.perf_counter()
+    try:
+        await coroutine_factory()
+    except DBAPIError:
+        return None
+    return time.perf_counter() - started_at
+
+
+def format_row(entity: str, n_rows: int, insert_time: float | None, copy_time: float) -> str:
+    if insert_time is None:
+        return f"{entity:<10}{n_rows:>10}{'failed':>12}{copy_time:>12.2f}{'-':>10}"
+    return f"{entity:<10}{n_rows:>10}{insert_time:>12.2f}{copy_time:>12.2f}{insert_time / copy_time:>10.1f}"
+
+
+async def run(rows: list[int]) -> None:
+    print(f"{'entity':<10}{'rows':>10}{'insert, s':>12}{'copy, s':>12}{'speedup':>10}")  # noqa:T201
+    for n_rows in rows:
+        orders = generate_order_dtos(n_rows)
+        insert_time = await measure(lambda: OrdersService.add_orders(orders))  # noqa:B023
+        copy_time = await measure(lambda: OrdersService.add_orders(orders, use_copy=True))  # noqa:B023
+        print(format_row("orders", n_rows, insert_time, copy_time))  # noqa:T201
+
+        couriers = generate_courier_dtos(n_rows)
+        insert_time = await measure(lambda: CourierService.add_couriers(couriers))  # noqa:B023
+        copy_time = await measure(lambda: CourierService.add_couriers(couriers, use_copy=True))  # noqa:B023
+        print(format_row("couriers", n_rows, insert_time, copy_time))  # noqa:T201
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+    with temporary_database():
+        asyncio.run(run(args.rows))
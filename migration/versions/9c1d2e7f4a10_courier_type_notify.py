@@ -0,0 +1,39 @@
+"""courier_type_notify
+
+Revision ID: 9c1d2e7f4a10
+Revises: 487b41c7d1aa
+Create Date: 2026-10-18 16:20:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9c1d2e7f4a10"
+down_revision = "487b41c7d1aa"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE FUNCTION notify_courier_type_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('courier_type_changed', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER courier_type_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON courier_type
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_courier_type_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER courier_type_changed ON courier_type")
+    op.execute("DROP FUNCTION notify_courier_type_changed()")
@@ -10,6 +10,8 @@ from sqlalchemy.pool import NullPool
 from sqlalchemy_utils import create_database, drop_database
 
 from app.db import db_config
+from app.db.area_registry import AREA_REGISTRY
+from app.db.courier_type_catalog import COURIER_TYPE_CATALOG
 from app.db.db_config import DbConfig, ProjectParams
 from app.main import app
 
@@ -49,6 +51,8 @@ def patch_config(setup_test_db, monkeypatch):
     )  # тут прихоидтся инжектить poolclass
     # чтобы в рамках одного теста можно было делать запрос к серверу + делать запросы через алхимию к базе
     monkeypatch.setattr(db_config, "DB_DATA", setup_test_db)
+    AREA_REGISTRY.clear()  # id районов из прошлой тестовой базы тут невалидны
+    COURIER_TYPE_CATALOG.clear()
     return setup_test_db
 
 
@@ -57,7 +61,7 @@ def apply_migration(patch_config):
     """Фикструа применяющая миграции к тестовой базе"""
     cfg = Config("./alembic.ini")
     mylogger.info("Накатили миграшки к бд")
-    command.upgrade(cfg, "487b41c7d1aa")
+    command.upgrade(cfg, "head")
     return patch_config
 
 
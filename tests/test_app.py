@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from sqlalchemy import select
 from starlette import status
@@ -5,6 +7,8 @@ from starlette import status
 from app.db.schema import Courier, Order
 from app.db.services.couriers_service import CourierService
 from app.db.services.orders_service import OrdersService
+from app.utils import stream_import
+from app.utils.ndjson import iter_ndjson_lines
 from utils.data_generators.api_to_dto import api_models_to_dto
 from utils.data_generators.generate_couriers import generate_couriers
 from utils.data_generators.generate_orders import generate_valid_orders
@@ -503,3 +507,42 @@ async def test_get_valid_statistic(client, courier_type, coeff):
     assert courier_type == response_data["courier_type"]
     assert api_couriers[0]["regions"] == response_data["regions"]
     assert api_couriers[0]["working_hours"] == response_data["working_hours"]
+
+
+@pytest.mark.asyncio()
+async def test_get_courier_types_with_version(client):
+    response = client.get("/courier-types")
+    assert response.status_code == status.HTTP_200_OK
+    response_data = response.json()
+    assert response_data["version"]
+    assert {courier_type["type_id"] for courier_type in response_data["courier_types"]} == {"FOOT", "BIKE", "AUTO"}
+
+
+@pytest.mark.asyncio()
+async def test_post_orders_stream(client, get_session, monkeypatch):
+    monkeypatch.setattr(stream_import, "ORDER_STREAM_CHUNK_SIZE", 3)
+    orders = generate_valid_orders(5)
+    lines = [order.json() for order in orders]
+    lines.insert(2, '{"weight": -1, "regions": 1, "delivery_hours": ["10:00-13:00"], "cost": 1000}')
+    lines.insert(4, "not a json")
+    response = client.post("/orders/stream", content="\n".join(lines) + "\n")
+    assert response.status_code == status.HTTP_200_OK
+    chunks = [json.loads(line) for line in response.text.splitlines()]
+    assert [chunk["chunk"] for chunk in chunks] == [0, 1, 2]
+    assert [chunk["order_ids"] for chunk in chunks] == [[1, 2], [3], [4, 5]]
+    assert [error["line"] for chunk in chunks for error in chunk["errors"]] == [3, 5]
+    async with get_session() as session:
+        db_orders_cursor = await session.execute(select(Order).order_by(Order.order_id))
+        db_orders = db_orders_cursor.scalars().all()
+        assert [db_order.cost for db_order in db_orders] == [order.cost for order in orders]
+
+
+@pytest.mark.asyncio()
+async def test_iter_ndjson_lines_skips_too_long_lines():
+    async def body():
+        yield b'{"a": 1}\n\n{"b"'
+        yield b": 2}\n" + b"x" * 20
+        yield b"x" * 20 + b'\n{"c": 3}'
+
+    lines = [line async for line in iter_ndjson_lines(body(), max_line_size=16)]
+    assert lines == [(1, b'{"a": 1}'), (3, b'{"b": 2}'), (4, None), (5, b'{"c": 3}')]
@@ -1,12 +1,19 @@
+import asyncio
 import logging
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event, func, select, text
+from sqlalchemy.exc import DBAPIError
 
-from app.db.schema import Courier, CourierType
+from app.db.area_registry import AREA_REGISTRY, AreaRegistry
+from app.db.courier_type_catalog import CourierTypeCatalog
+from app.db.schema import Area, Courier, CourierType, Order, OrderDeliveryHour
+from app.db.services import orders_service
 from app.db.services.couriers_service import CourierService
+from app.db.services.orders_service import OrdersService
 from utils.data_generators.api_to_dto import api_models_to_dto
 from utils.data_generators.generate_couriers import generate_couriers
+from utils.data_generators.generate_orders import generate_valid_orders
 
 logging.basicConfig(level=logging.DEBUG)
 mylogger = logging.getLogger()
@@ -51,3 +58,120 @@ async def test_valid_couriers_created_in_db(get_session):
         stmt = select(Courier)
         res = await session.execute(stmt)
         assert len(res.scalars().all()) == 100
+
+
+@pytest.mark.asyncio()
+async def test_add_orders_by_copy_keeps_request_order(get_session):
+    """Проверяю, что импорт заказов через COPY возвращает id в порядке запроса и пишет часы доставки"""
+    api_orders_generated = generate_valid_orders(300)
+    dto_orders = [api_models_to_dto(order) for order in api_orders_generated]
+    added_orders_id = await OrdersService.add_orders(dto_orders, use_copy=True)
+    assert added_orders_id == list(range(1, 301))
+    async with get_session() as session:
+        for order_id in (1, 150, 300):
+            db_order = await session.get(Order, order_id)
+            api_order = api_orders_generated[order_id - 1]
+            assert db_order.cost == api_order.cost
+            assert db_order.weight == api_order.weight
+            assert db_order.area.area_number == api_order.regions
+            assert db_order.assigned is False
+            assert len(db_order.delivery_hours) == len(api_order.delivery_hours)
+
+
+@pytest.mark.asyncio()
+async def test_add_couriers_by_copy_keeps_request_order(get_session):
+    """Проверяю, что импорт курьеров через COPY возвращает id в порядке запроса и сохраняет районы и часы работы"""
+    api_couriers_generated = generate_couriers(300)
+    dto_couriers = [api_models_to_dto(courier) for courier in api_couriers_generated.couriers]
+    added_couriers_id = await CourierService.add_couriers(dto_couriers, use_copy=True)
+    assert added_couriers_id == list(range(1, 301))
+    async with get_session() as session:
+        for courier_id in (1, 150, 300):
+            db_courier = await session.get(Courier, courier_id)
+            api_courier = api_couriers_generated.couriers[courier_id - 1]
+            assert db_courier.courier_type == api_courier.courier_type
+            assert [area.area_number for area in db_courier.areas] == api_courier.regions
+            assert len(db_courier.worked_hours) == len(api_courier.working_hours)
+
+
+@pytest.mark.asyncio()
+async def test_add_orders_one_statement_per_chunk(get_session, apply_migration, monkeypatch):
+    """Проверяю, что районы, заказы и часы доставки одной части пишутся одним запросом"""
+    monkeypatch.setattr(orders_service, "ORDER_INSERT_CHUNK_SIZE", 50)
+    await AREA_REGISTRY.resolve(range(1, 100))  # районы уже известны, в базу идут только заказы
+    executed_statements = []
+    engine = apply_migration.get_engine().sync_engine
+
+    def count_statement(connection, cursor, statement, *args) -> None:  # noqa:ANN002
+        executed_statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        await OrdersService.add_orders([api_models_to_dto(order) for order in generate_valid_orders(120)])
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    assert len(executed_statements) == 3
+    async with get_session() as session:
+        delivery_hours_count = await session.execute(select(func.count()).select_from(OrderDeliveryHour))
+        assert delivery_hours_count.scalar() > 0
+
+
+@pytest.mark.asyncio()
+async def test_add_orders_failed_chunk_rollbacks_whole_import(get_session, monkeypatch):
+    """Проверяю, что если одна из частей импорта падает, в базе не остается заказов и из предыдущих частей"""
+    monkeypatch.setattr(orders_service, "ORDER_INSERT_CHUNK_SIZE", 10)
+    dto_orders = [api_models_to_dto(order) for order in generate_valid_orders(20)]
+    dto_orders[-1].cost = 2**40
+    with pytest.raises(DBAPIError):
+        await OrdersService.add_orders(dto_orders)
+    async with get_session() as session:
+        orders_count = await session.execute(select(func.count()).select_from(Order))
+        assert orders_count.scalar() == 0
+
+
+@pytest.mark.asyncio()
+async def test_area_registry_goes_to_db_only_for_unseen_areas(get_session):
+    """Проверяю, что реестр районов создает районы в базе и повторно отдает их id из памяти"""
+    registry = AreaRegistry(maxsize=2)
+    first_resolve = await registry.resolve([5, 7])
+    assert registry.cache.stats().misses == 2
+    assert await registry.resolve([7, 5]) == first_resolve
+    assert registry.cache.stats().hits == 2
+    await registry.resolve([9])
+    assert registry.cache.stats().evictions == 1
+    async with get_session() as session:
+        db_areas = await session.execute(select(Area.area_number, Area.area_id))
+        assert dict(db_areas.all()) == {**first_resolve, 9: registry.cache.get(9)}
+
+
+@pytest.mark.asyncio()
+async def test_courier_type_catalog_matches_db(get_session):
+    """Проверяю, что справочник типов курьеров в памяти совпадает с таблицей courier_type"""
+    catalog = CourierTypeCatalog()
+    courier_types = await catalog.get_types()
+    assert set(courier_types) == {"FOOT", "BIKE", "AUTO"}
+    assert courier_types["BIKE"].max_area == 2
+    assert courier_types["AUTO"].max_orders_count == 7
+    with pytest.raises(TypeError):
+        courier_types["FOOT"] = courier_types["AUTO"]
+
+
+@pytest.mark.asyncio()
+async def test_courier_type_catalog_reloads_on_notification(get_session):
+    """Проверяю, что изменение courier_type перечитывает справочник через NOTIFY и меняет его версию"""
+    catalog = CourierTypeCatalog()
+    await catalog.reload()
+    first_version = catalog.version
+    await catalog.start_listening()
+    try:
+        async with get_session() as session:
+            await session.execute(text("UPDATE courier_type SET max_area = 4 WHERE id = 'AUTO'"))
+            await session.commit()
+        for _ in range(50):
+            if catalog.version != first_version:
+                break
+            await asyncio.sleep(0.1)
+    finally:
+        await catalog.stop_listening()
+    assert catalog.version != first_version
+    assert (await catalog.get("AUTO")).max_area == 4
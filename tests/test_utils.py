@@ -1,5 +1,6 @@
 import pytest
 
+from app.utils.lru_cache import LRUCache
 from app.utils.split_list import split_list
 
 
@@ -14,3 +15,24 @@ from app.utils.split_list import split_list
 def test_split_list(split_list_param, output_len: list[int]) -> None:
     split_list_res = list(split_list(**split_list_param))
     assert len(split_list_res) == output_len
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache = LRUCache(maxsize=2)
+    cache.put(1, "first")
+    cache.put(2, "second")
+    assert cache.get(1) == "first"
+    cache.put(3, "third")
+    assert 2 not in cache
+    assert cache.get(1) == "first"
+    assert cache.get(3) == "third"
+    assert cache.stats().dict() == {"size": 2, "maxsize": 2, "hits": 3, "misses": 0, "evictions": 1}
+
+
+def test_lru_cache_counts_misses() -> None:
+    cache = LRUCache(maxsize=2)
+    assert cache.get("absent") is None
+    assert cache.get("absent", 0) == 0
+    assert cache.misses == 2
+    cache.clear()
+    assert cache.misses == 0